@@ -1,10 +1,15 @@
-from fastapi import FastAPI, Request
+import os
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import pathlib
 
-from chains.conversational_qa import rag_chain
+from chains.conversational_qa import rag_chain, rephrase_cache
+from config import ADMIN_TOKEN, INDEX_WATCH_INTERVAL
+from models import index_manager
 
 
 app = FastAPI(title="RAG API")
@@ -17,9 +22,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def start_index_watcher():
+    # Started per worker: threads of a preloading parent do not survive the fork
+    if INDEX_WATCH_INTERVAL > 0:
+        index_manager.watch(INDEX_WATCH_INTERVAL)
+
 class ChatInput(BaseModel):
     message: str
 
+class ReloadInput(BaseModel):
+    version: Optional[str] = None
+
+def check_admin_token(token: Optional[str]) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled.")
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
 @app.get("/", response_class=HTMLResponse)
 def index():
     html = pathlib.Path("index.html").read_text(encoding="utf-8")
@@ -34,6 +54,23 @@ def chat(inp: ChatInput):
     answer = result["answer"] if isinstance(result, dict) and "answer" in result else str(result)
     return {"answer": answer}
 
+@app.get("/admin/index")
+def index_status(x_admin_token: Optional[str] = Header(default=None)):
+    check_admin_token(x_admin_token)
+    return {**index_manager.status(), "pid": os.getpid(), "workers": index_manager.worker_statuses()}
+
+@app.get("/admin/cache")
+def cache_stats(x_admin_token: Optional[str] = Header(default=None)):
+    check_admin_token(x_admin_token)
+    return {"rephrase": rephrase_cache.stats()}
+
+@app.post("/admin/index/reload", status_code=202)
+def index_reload(inp: ReloadInput = ReloadInput(), x_admin_token: Optional[str] = Header(default=None)):
+    check_admin_token(x_admin_token)
+    if not index_manager.request_reload(inp.version):
+        return JSONResponse({"status": "A reload is already in progress."}, status_code=409)
+    return {"status": "loading", "version": inp.version or "latest"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
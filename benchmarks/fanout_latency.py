@@ -0,0 +1,86 @@
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from constants import FAISS_INDEX_PATH, FAISS_SHARDS_PATH
+from ingests.embeddings import get_embeddings_model
+from ingests.storage import load_faiss_index
+from models.sharded_retriever import ShardedRetriever
+
+
+# =============== Constants ===============
+QUERIES: List[str] = [
+    "graph neural networks for molecule property prediction",
+    "retrieval augmented generation for question answering",
+    "differential privacy in federated learning",
+    "formal verification of smart contracts",
+    "self-supervised learning for speech recognition",
+    "robot motion planning under uncertainty",
+    "compiler optimizations for GPU kernels",
+    "adversarial robustness of image classifiers",
+]
+K = 5
+REPEATS = 20
+
+
+# ======================================
+#          Benchmark Functions
+# ======================================
+
+def time_search(search: Callable[[List[float]], object],
+                vectors: List[List[float]],
+                repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Time a search function over pre-computed query embeddings.
+
+    Queries are embedded beforehand so that only the index search (and, for
+    the sharded retriever, the fan-out and heap merge) is measured.
+
+    Returns:
+        Dict[str, float]: Mean, p50 and p95 latencies in milliseconds.
+    """
+    for vector in vectors:  # warm-up
+        search(vector)
+
+    latencies = []
+    for _ in range(repeats):
+        for vector in vectors:
+            start = time.perf_counter()
+            search(vector)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95)],
+    }
+
+def benchmark_fanout(k: int = K, repeats: int = REPEATS) -> Dict[str, Dict[str, float]]:
+    """
+    Compare search latency of the monolithic index against the sharded index.
+
+    Three configurations are measured: the monolithic FAISS index, a fan-out
+    over every shard, and a search restricted to the single largest shard
+    (what a category filter costs).
+    """
+    embeddings = get_embeddings_model()
+    vectors = embeddings.embed_documents(QUERIES)
+
+    monolithic = load_faiss_index(FAISS_INDEX_PATH, embeddings)
+    sharded = ShardedRetriever.load(embeddings=embeddings, path=FAISS_SHARDS_PATH)
+    largest = max(sharded.shards, key=lambda name: sharded.shards[name].index.ntotal)
+
+    return {
+        f"monolithic ({monolithic.index.ntotal} vectors)":
+            time_search(lambda v: monolithic.similarity_search_with_score_by_vector(v, k), vectors, repeats),
+        f"sharded fan-out ({len(sharded.shards)} shards)":
+            time_search(lambda v: sharded.similarity_search_with_score_by_vector(v, k), vectors, repeats),
+        f"single shard {largest} ({sharded.shards[largest].index.ntotal} vectors)":
+            time_search(lambda v: sharded.similarity_search_with_score_by_vector(v, k, shards=[largest]), vectors, repeats),
+    }
+
+
+if __name__ == "__main__":
+    for name, stats in benchmark_fanout().items():
+        print(f"{name:<55} mean={stats['mean_ms']:.2f}ms  p50={stats['p50_ms']:.2f}ms  p95={stats['p95_ms']:.2f}ms")
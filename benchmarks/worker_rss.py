@@ -0,0 +1,121 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+# Linux only: memory is read from /proc/<pid>/status and /proc/<pid>/smaps_rollup
+
+
+# =============== Constants ===============
+WORKER_COUNTS: List[int] = [1, 2, 4]
+PORT = 8765
+STARTUP_TIMEOUT_SECONDS = 600
+SETTLE_SECONDS = 10
+
+
+# ======================================
+#          Benchmark Functions
+# ======================================
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces: the ppid is the 2nd field after ')'
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(entry))
+    return children
+
+def process_tree(pid: int) -> List[int]:
+    """
+    Return `pid` and all its descendants.
+    """
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(_children(current))
+    return tree
+
+def _read_kb(path: str, field: str) -> int:
+    with open(path) as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+def tree_memory_mb(pid: int) -> Dict[str, float]:
+    """
+    Sum the memory of a process tree.
+
+    RSS counts shared pages once per process, so it over-states the real
+    footprint of forked workers; PSS splits each shared page between the
+    processes mapping it, and its sum is the actual memory used.
+
+    Returns:
+        Dict[str, float]: Total RSS and PSS in MB, and the number of processes.
+    """
+    rss = pss = 0
+    pids = process_tree(pid)
+    for p in pids:
+        try:
+            rss += _read_kb(f"/proc/{p}/status", "VmRSS")
+            pss += _read_kb(f"/proc/{p}/smaps_rollup", "Pss")
+        except OSError:
+            continue
+    return {"rss_mb": rss / 1024, "pss_mb": pss / 1024, "processes": len(pids)}
+
+def _wait_until_ready(proc: subprocess.Popen, expected_processes: int) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}.")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{PORT}/openapi.json", timeout=2)
+            if len(process_tree(proc.pid)) >= expected_processes:
+                time.sleep(SETTLE_SECONDS)
+                return
+        except OSError:
+            pass
+        time.sleep(1)
+    raise TimeoutError("Server did not start in time.")
+
+def measure(mode: str, workers: int) -> Dict[str, float]:
+    """
+    Start the API with `workers` worker processes and measure its memory.
+
+    Args:
+        mode (str): "uvicorn" (`uvicorn --workers`, every worker loads its own
+            model and index) or "gunicorn" (preloaded app, forked workers).
+        workers (int): Number of worker processes.
+    """
+    if mode == "uvicorn":
+        cmd = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(PORT), "--workers", str(workers)]
+    else:
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--workers", str(workers),
+               "--bind", f"127.0.0.1:{PORT}"]
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_until_ready(proc, expected_processes=workers + 1)
+        return tree_memory_mb(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    print(f"{'mode':<10}{'workers':>8}{'processes':>11}{'RSS (MB)':>12}{'PSS (MB)':>12}")
+    for mode in ("uvicorn", "gunicorn"):
+        for n in WORKER_COUNTS:
+            stats = measure(mode, n)
+            print(f"{mode:<10}{n:>8}{stats['processes']:>11}{stats['rss_mb']:>12.0f}{stats['pss_mb']:>12.0f}")
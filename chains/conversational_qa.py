@@ -5,8 +5,9 @@ from langchain.schema import Document
 from langchain_core.runnables.base import RunnableLambda, RunnableSequence
 from langchain_openai import ChatOpenAI
 
-from constants import LLM_MODEL_NAME
-from models import vector_store
+from chains.rephrase_cache import RephraseCache, prompt_fingerprint
+from constants import LLM_MODEL_NAME, REPHRASE_CACHE_MAX_ENTRIES, REPHRASE_CACHE_PATH
+from models import index_manager
 from prompt import ANSWER_PROMPT, REPHRASE_PROMPT
 from utils import format_context, reciprocal_rank_fusion
 from config import OPENAI_API_KEY
@@ -17,6 +18,14 @@ from config import OPENAI_API_KEY
 llm = ChatOpenAI(model=LLM_MODEL_NAME, temperature=0, api_key=OPENAI_API_KEY)
 
 
+# ========== Rephrase Cache ========== #
+rephrase_cache = RephraseCache(
+    path = REPHRASE_CACHE_PATH,
+    prompt_version = prompt_fingerprint(REPHRASE_PROMPT, LLM_MODEL_NAME),
+    max_entries = REPHRASE_CACHE_MAX_ENTRIES
+)
+
+
 # ========== Conversation Memory ========== #
 memory = ConversationBufferWindowMemory(
     memory_key = "chat_history",
@@ -37,7 +46,9 @@ def generate_alternative_queries(query: str,
     This function sends the original query along with the chat history to the
     language model (LLM) to produce multiple rephrased versions of the query.
     It ensures uniqueness by ignoring case and returns the original query
-    followed by up to `n` unique alternative queries.
+    followed by up to `n` unique alternative queries. As the LLM runs at
+    temperature 0, the alternatives are cached persistently per (question,
+    chat history, prompt) and reused instead of calling the LLM again.
 
     Args:
         query (str): The original user query.
@@ -48,13 +59,19 @@ def generate_alternative_queries(query: str,
         List[str]: A list containing the original query and its unique alternative
                    phrasings, limited to `n + 1` items in total.
     """
-    messages = REPHRASE_PROMPT.format_messages(
-        question=query,
-        n=n,
-        chat_history=memory.chat_memory.messages
-    )
-    responses = llm.invoke(messages)
-    lines = [q.strip() for q in responses.content.splitlines() if q.strip()]
+    chat_history = memory.chat_memory.messages
+    cache_key = rephrase_cache.key(query, chat_history, n)
+    lines = rephrase_cache.get(cache_key)
+    if lines is None:
+        messages = REPHRASE_PROMPT.format_messages(
+            question=query,
+            n=n,
+            chat_history=chat_history
+        )
+        responses = llm.invoke(messages)
+        lines = [q.strip() for q in responses.content.splitlines() if q.strip()]
+        if lines:
+            rephrase_cache.put(cache_key, lines)
     queries = [query] + lines
     seen, unique = set(), []
     for q in queries:
@@ -75,7 +92,7 @@ def retrieval_and_fusion(queries: List[str],
     Retrieve documents for multiple queries and combine the results using Reciprocal Rank Fusion (RRF).
 
     For each query in `queries`, this function retrieves the top `k_per_query` documents
-    from the vector store. Then it applies Reciprocal Rank Fusion to merge the results
+    from the currently served vector store. Then it applies Reciprocal Rank Fusion to merge the results
     across all queries, producing a single ranked list of documents. Finally, only the
     Document objects are returned, discarding their scores.
 
@@ -88,7 +105,9 @@ def retrieval_and_fusion(queries: List[str],
     Returns:
         List[Document]: A list of fused Document objects, ranked according to RRF.
     """
-    per_query_results = [vector_store.similarity_search(q, k=k_per_query) for q in queries]
+    # Borrow one index for the whole request so that a hot-swap never mixes versions
+    with index_manager.acquire() as vector_store:
+        per_query_results = [vector_store.similarity_search(q, k=k_per_query) for q in queries]
     fused = reciprocal_rank_fusion(per_query_results, k=rrf_k, top_n=top_n)
     fused_docs = [doc for doc, _ in fused]
     return fused_docs
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+
+class RephraseCache:
+    """
+    A persistent, size-bounded cache of LLM query rephrasings backed by SQLite.
+
+    The rephrase LLM call runs at temperature 0, so its output only depends on
+    the question, the chat history and the prompt. Entries are keyed by the
+    normalized question, the number of alternatives, a hash of the history and
+    a fingerprint of the prompt and model, so changing any of them misses. The
+    least recently used entries are evicted beyond `max_entries`. Hits and
+    misses are counted in the same database, so the hit rate covers every
+    worker process and survives restarts.
+    """
+
+    def __init__(self, path: str, prompt_version: str, max_entries: int = 10_000):
+        self.path = path
+        self.prompt_version = prompt_version
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared with forked worker processes
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rephrasings ("
+                "key TEXT PRIMARY KEY, alternatives TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON rephrasings (last_used)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def key(self, question: str, history: Sequence[BaseMessage], n: int) -> str:
+        """
+        Build the cache key of a rephrasing request.
+        """
+        normalized = re.sub(r"\s+", " ", question).strip().lower()
+        history_hash = hashlib.sha256(
+            json.dumps([(m.type, m.content) for m in history], default=str).encode("utf-8")
+        ).hexdigest()
+        payload = json.dumps([self.prompt_version, n, history_hash, normalized])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Return the cached alternatives for `key`, or None on a miss.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    row = conn.execute("SELECT alternatives FROM rephrasings WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        conn.execute("UPDATE rephrasings SET last_used = ? WHERE key = ?", (time.time(), key))
+                    conn.execute(
+                        "INSERT INTO stats (name, value) VALUES (?, 1) "
+                        "ON CONFLICT (name) DO UPDATE SET value = value + 1",
+                        ("misses" if row is None else "hits",)
+                    )
+            except sqlite3.Error as e:
+                print(f"Rephrase cache read failed: {e}")
+                return None
+            return None if row is None else json.loads(row[0])
+
+    def put(self, key: str, alternatives: List[str]) -> None:
+        """
+        Store the alternatives of `key` and evict the least recently used entries.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO rephrasings (key, alternatives, last_used) VALUES (?, ?, ?)",
+                    (key, json.dumps(alternatives), time.time())
+                )
+                conn.execute(
+                    "DELETE FROM rephrasings WHERE key IN ("
+                    "SELECT key FROM rephrasings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Rephrase cache write failed: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Return the hit-rate metrics of every process using the cache and the number of stored entries.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                entries = conn.execute("SELECT COUNT(*) FROM rephrasings").fetchone()[0]
+                counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            except sqlite3.Error:
+                entries, counters = None, {}
+            hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": entries,
+                "max_entries": self.max_entries,
+            }
+
+
+def prompt_fingerprint(prompt: ChatPromptTemplate, model_name: str) -> str:
+    """
+    Return a short hash identifying a prompt template and the model it is sent to.
+    """
+    parts = [
+        # Message templates have a `prompt`, placeholders only a `variable_name`
+        (type(m).__name__, getattr(getattr(m, "prompt", None), "template", None) or getattr(m, "variable_name", ""))
+        for m in prompt.messages
+    ]
+    payload = json.dumps([model_name, parts])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
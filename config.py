@@ -8,4 +8,13 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 LANGSMITH_TRACING_V2 = os.getenv("LANGSMITH_TRACING_V2")
 LANGSMITH_ENDPOINT = os.getenv("LANGSMITH_ENDPOINT")
 LANGSMITH_API_KEY = os.getenv("LANGSMITH_API_KEY")
-LANGSMITH_PROJECT = os.getenv("LANGSMITH_PROJECT")
\ No newline at end of file
+LANGSMITH_PROJECT = os.getenv("LANGSMITH_PROJECT")
+
+# Comma-separated shard names served by this node ("*" for every shard).
+# Leave unset to serve the monolithic FAISS index.
+SERVED_SHARDS = os.getenv("SERVED_SHARDS")
+
+# Seconds between two checks for a newly published index version (0 disables the watcher).
+INDEX_WATCH_INTERVAL = float(os.getenv("INDEX_WATCH_INTERVAL", "0"))
+# Token expected in the X-Admin-Token header of the admin endpoints (unset disables them).
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
\ No newline at end of file
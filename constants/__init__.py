@@ -1,4 +1,6 @@
 from .constants import *
 
 __all__ = ["ARXIV_CATEGORIES", "ARXIV_API_BASE_URL", "DATA_PATH", 
-                      "EMBEDDINGS_MODEL_NAME", "LLM_MODEL_NAME", "FAISS_INDEX_PATH"] 
\ No newline at end of file
+                      "EMBEDDINGS_MODEL_NAME", "LLM_MODEL_NAME", "FAISS_INDEX_PATH",
+                      "FAISS_SHARDS_PATH", "N_HASH_SHARDS", "INDEX_VERSIONS_PATH", "INDEX_VERSIONS_KEEP",
+                      "REPHRASE_CACHE_PATH", "REPHRASE_CACHE_MAX_ENTRIES"] 
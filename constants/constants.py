@@ -16,4 +16,16 @@ EMBEDDINGS_MODEL_NAME = "allenai-specter"
 
 LLM_MODEL_NAME = "gpt-4o-mini"
 
-FAISS_INDEX_PATH = "./faiss_index"
\ No newline at end of file
+FAISS_INDEX_PATH = "./faiss_index"
+
+FAISS_SHARDS_PATH = "./faiss_shards"
+
+N_HASH_SHARDS = 8
+
+INDEX_VERSIONS_PATH = "./index_versions"
+
+INDEX_VERSIONS_KEEP = 3
+
+REPHRASE_CACHE_PATH = "./cache/rephrase_cache.sqlite3"
+
+REPHRASE_CACHE_MAX_ENTRIES = 10_000
@@ -1,27 +1,216 @@
 import os
+import re
+import zlib
+from collections import defaultdict
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
-from collector import main_articles_collection
 
 from constants import DATA_PATH 
+from data_collection.collector import main_articles_collection
 from utils import regex_for_title
 
 
+# =============== Constants ===============
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+# =============== Near-Duplicate Detection ===============
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word n-grams (shingles) of a text.
+
+    Parameters
+    ----------
+    text : str
+        The text to shingle, lower-cased and stripped of punctuation first.
+    size : int, default SHINGLE_SIZE
+        Number of words per shingle.
+
+    Returns
+    -------
+    np.ndarray
+        The unique 32-bit hashes of the shingles (empty if the text is empty).
+    """
+    words = re.findall(r"\w+", text.lower()) if isinstance(text, str) else []
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i: i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+def minhash_signatures(texts: List[str],
+                       num_perm: int = MINHASH_PERMUTATIONS,
+                       seed: int = 42) -> np.ndarray:
+    """
+    Compute the MinHash signature of each text.
+
+    Each of the `num_perm` hash functions is a universal hash
+    (a * x + b) mod p applied to the shingle hashes, and the signature keeps
+    the minimum per function. The fraction of equal signature values between
+    two texts estimates the Jaccard similarity of their shingle sets.
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts to sign.
+    num_perm : int, default MINHASH_PERMUTATIONS
+        Length of the signatures.
+    seed : int, default 42
+        Seed of the random hash functions.
+
+    Returns
+    -------
+    np.ndarray
+        A (len(texts), num_perm) array of signatures. Texts without any
+        shingle get a signature filled with the maximum hash value.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MAX_HASH, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, _MAX_HASH, size=(num_perm, 1), dtype=np.uint64)
+
+    signatures = np.full((len(texts), num_perm), _MAX_HASH, dtype=np.uint64)
+    for i, text in enumerate(texts):
+        hashes = shingles(text)
+        if hashes.size:
+            signatures[i] = (((a * hashes + b) % _MERSENNE_PRIME) & _MAX_HASH).min(axis=1)
+    return signatures
+
+def near_duplicate_clusters(signatures: np.ndarray,
+                            bands: int = LSH_BANDS,
+                            threshold: float = NEAR_DUPLICATE_THRESHOLD) -> np.ndarray:
+    """
+    Cluster near-duplicate signatures with LSH banding.
+
+    Signatures are cut into `bands` bands; two texts sharing a band bucket are
+    candidates, and candidates whose estimated Jaccard similarity reaches
+    `threshold` are merged with a union-find. Each text is only compared to
+    the first member of its buckets, so the cost stays roughly linear in the
+    number of texts.
+
+    Parameters
+    ----------
+    signatures : np.ndarray
+        MinHash signatures from `minhash_signatures`.
+    bands : int, default LSH_BANDS
+        Number of LSH bands; must divide the signature length.
+    threshold : float, default NEAR_DUPLICATE_THRESHOLD
+        Minimum estimated Jaccard similarity of two near-duplicates.
+
+    Returns
+    -------
+    np.ndarray
+        The cluster label of each text (the index of its cluster root).
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"The signature length ({num_perm}) must be a multiple of bands ({bands}).")
+    rows = num_perm // bands
+    parent = np.arange(n)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    empty = (signatures == _MAX_HASH).all(axis=1)
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_values = signatures[:, band * rows: (band + 1) * rows]
+        for i in np.flatnonzero(~empty):
+            buckets[band_values[i].tobytes()].append(i)
+
+        for members in buckets.values():
+            first = members[0]
+            for other in members[1:]:
+                root_first, root_other = find(first), find(other)
+                if root_first == root_other:
+                    continue
+                if (signatures[first] == signatures[other]).mean() >= threshold:
+                    parent[max(root_first, root_other)] = min(root_first, root_other)
+
+    return np.array([find(i) for i in range(n)])
+
+def drop_near_duplicates(data: pd.DataFrame,
+                         threshold: float = NEAR_DUPLICATE_THRESHOLD) -> pd.DataFrame:
+    """
+    Keep one article per cluster of near-duplicate abstracts.
+
+    Cross-listed papers, revisions and lightly edited abstracts are clustered
+    on their "summary" with MinHash + LSH. The most recent article of each
+    cluster is kept as the canonical one, with the categories of the whole
+    cluster merged into its "category" column.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Articles with at least the "summary", "category" and "date" columns.
+    threshold : float, default NEAR_DUPLICATE_THRESHOLD
+        Minimum estimated Jaccard similarity of two near-duplicates.
+
+    Returns
+    -------
+    pd.DataFrame
+        The deduplicated articles, in their original order.
+    """
+    if data.empty:
+        return data
+
+    signatures = minhash_signatures(data["summary"].tolist())
+    clusters = near_duplicate_clusters(signatures, threshold=threshold)
+
+    # Most recent article first in each cluster: it is the canonical one, and its
+    # categories (primary category included) come first in the merged list
+    by_recency = (data
+                  .assign(_cluster = clusters)
+                  .sort_values("date", ascending=False, na_position="last", kind="stable")
+                  )
+    merged_categories = (by_recency
+                         .groupby("_cluster", sort=False)["category"]
+                         .agg(lambda cats: ", ".join(dict.fromkeys(
+                             c for cat in cats if isinstance(cat, str) for c in cat.split(", ") if c
+                         )))
+                         )
+
+    deduplicated = by_recency.drop_duplicates(subset=["_cluster"]).sort_index()
+    deduplicated["category"] = deduplicated["_cluster"].map(merged_categories)
+    deduplicated = deduplicated.drop(columns=["_cluster"])
+
+    removed = len(data) - len(deduplicated)
+    print(f"Near-duplicates: {removed} of {len(data)} articles removed "
+          f"({removed / len(data):.1%}), {len(deduplicated)} kept.")
+    return deduplicated
+
+
 # =============== Main Data Preprocessor ===============
 
-def data_preprocessor(export: bool = True) -> pd.DataFrame:
+def data_preprocessor(export: bool = True,
+                      near_duplicates: bool = True) -> pd.DataFrame:
     """
     Fetch and preprocess articles from the main collection.
 
     This function collects articles, extracts key information, cleans duplicates,
     filters categories to only Computer Science fields (cs.*), and converts the 
     publication date to a datetime object. It also generates a direct PDF URL for each article.
+    Near-duplicate abstracts (cross-listings, revisions, light edits) are then
+    collapsed into a single canonical article with merged categories.
 
     Parameters
     ----------
     export : bool, default False
         If True, the resulting DataFrame is saved as a parquet file at DATA_PATH.
+    near_duplicates : bool, default True
+        If True, near-duplicate abstracts are removed with `drop_near_duplicates`.
 
     Returns
     -------
@@ -59,6 +248,9 @@ def data_preprocessor(export: bool = True) -> pd.DataFrame:
             .drop(columns=["published"])
             .reset_index(drop=True)
             )
+
+    if near_duplicates:
+        data = drop_near_duplicates(data).reset_index(drop=True)
     
     if export:
         data.to_parquet(DATA_PATH, engine="fastparquet")
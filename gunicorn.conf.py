@@ -0,0 +1,33 @@
+import gc
+import os
+
+# Multi-worker serving: `gunicorn -c gunicorn.conf.py`
+#
+# The app (SPECTER model, FAISS index, docstore) is loaded once in the master
+# process and the workers are forked from it, so they share its pages
+# copy-on-write instead of each loading their own copy.
+
+wsgi_app = "app:app"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_WORKERS", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = 120
+
+# An admin reload only reaches the worker answering it; the other workers pick it
+# up from the versions directory with their index watcher, which must therefore run
+os.environ.setdefault("INDEX_WATCH_INTERVAL", "5")
+
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", "1"))
+
+
+def when_ready(server):
+    # Move everything allocated while preloading to the permanent generation, so
+    # that the workers' garbage collections do not write to (and copy) those pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    import torch
+
+    # One intra-op pool per worker: the workers already use every core between them
+    torch.set_num_threads(TORCH_THREADS_PER_WORKER)
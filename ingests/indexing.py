@@ -1,13 +1,21 @@
+import hashlib
 import os
-from typing import List
+import shutil
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
 
 import pandas as pd
 from langchain.schema import Document
 from langchain.vectorstores import FAISS, VectorStore
+from langchain_core.embeddings import Embeddings
 from tqdm import tqdm
 
-from constants import DATA_PATH, FAISS_INDEX_PATH
+from constants import DATA_PATH, FAISS_INDEX_PATH, FAISS_SHARDS_PATH, INDEX_VERSIONS_KEEP, N_HASH_SHARDS
 from ingests.embeddings import get_embeddings_model
+from ingests.storage import save_faiss_index
+from ingests.versions import new_version_name, prune_versions, publish_version, staging_dir
+from utils.helpers import _stable_doc_id
 
  
 def transform_to_docs(data: pd.DataFrame) -> List[Document]:
@@ -59,8 +67,116 @@ def transform_to_docs(data: pd.DataFrame) -> List[Document]:
     print(f"{len(docs)} documents created successfully.")
     return docs
 
+def _build_faiss_store(docs: List[Document],
+                       embeddings_model: Embeddings,
+                       batch_size: int = 512) -> FAISS:
+    """
+    Embed a list of Documents into a new FAISS vector store, batch by batch.
+
+    Args:
+        docs (List[Document]): The Documents to embed and index.
+        embeddings_model (Embeddings): The embedding model shared by all batches.
+        batch_size (int, optional): Number of documents to process at a time. Default is 512.
+
+    Returns:
+        FAISS: The in-memory FAISS vector store.
+    """
+    # Initialize FAISS with the first batch
+    initial_batch = docs[:batch_size]
+    faiss_store = FAISS.from_documents(initial_batch, embedding=embeddings_model)
+
+    # Add remaining documents in batches
+    for idx in tqdm(range(batch_size, len(docs), batch_size), desc="Adding documents to FAISS"):
+        batch_docs = docs[idx: idx + batch_size]
+        faiss_store.add_documents(batch_docs)
+
+    return faiss_store
+
+def primary_category(doc: Document) -> str:
+    """
+    Return the primary Computer Science category of a Document.
+
+    The arXiv feed lists the primary category first, and the preprocessing step
+    keeps the original order, so the first `cs.*` code of the "category"
+    metadata is used. Documents without any category fall back to "cs.OH".
+
+    Args:
+        doc (Document): The Document whose category is read.
+
+    Returns:
+        str: An arXiv category code (e.g., 'cs.AI').
+    """
+    categories = [c.strip() for c in (doc.metadata.get("category") or "").split(",") if c.strip()]
+    return categories[0] if categories else "cs.OH"
+
+def hash_shard(doc: Document, n_shards: int = N_HASH_SHARDS) -> str:
+    """
+    Return the name of the hash-range shard a Document belongs to.
+
+    The shard is derived from an MD5 digest of the Document stable identifier,
+    so the assignment does not depend on the process or on the indexing order.
+
+    Args:
+        doc (Document): The Document to assign.
+        n_shards (int, optional): Total number of hash shards. Default is N_HASH_SHARDS.
+
+    Returns:
+        str: A shard name such as 'shard-003-of-008'.
+    """
+    digest = hashlib.md5(_stable_doc_id(doc).encode("utf-8")).hexdigest()
+    return f"shard-{int(digest, 16) % n_shards:03d}-of-{n_shards:03d}"
+
+def split_into_shards(docs: List[Document],
+                      shard_by: str = "category",
+                      n_shards: int = N_HASH_SHARDS) -> Dict[str, List[Document]]:
+    """
+    Group Documents by shard name.
+
+    Args:
+        docs (List[Document]): The Documents to split.
+        shard_by (str, optional): "category" to shard by primary arXiv category,
+            or "hash" to shard by hash range. Default is "category".
+        n_shards (int, optional): Number of shards when `shard_by` is "hash".
+
+    Returns:
+        Dict[str, List[Document]]: The Documents of each shard, keyed by shard name.
+
+    Raises:
+        ValueError: If `shard_by` is not a supported strategy.
+    """
+    if shard_by == "category":
+        key = primary_category
+    elif shard_by == "hash":
+        key = lambda doc: hash_shard(doc, n_shards)
+    else:
+        raise ValueError(f"Unknown sharding strategy: {shard_by!r}. Use 'category' or 'hash'.")
+
+    shards: Dict[str, List[Document]] = defaultdict(list)
+    for doc in docs:
+        shards[key(doc)].append(doc)
+    return dict(sorted(shards.items()))
+
+def _replace_dir(staged: str, target: str) -> None:
+    """
+    Replace the `target` directory with the fully written `staged` one.
+
+    The previous content of `target` is removed, so that files from an older
+    build (e.g. shards that no longer exist) are never served with the new one.
+    Its files are unlinked, not truncated, so processes still memory-mapping
+    them keep reading the old build safely.
+    """
+    previous = target.rstrip(os.sep) + ".previous"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(target):
+        os.rename(target, previous)
+    os.rename(staged, target)
+    shutil.rmtree(previous, ignore_errors=True)
+
 def get_ingests(docs: List[Document], 
-                batch_size: int = 512) -> VectorStore:
+                batch_size: int = 512,
+                shard_by: Optional[str] = None,
+                n_shards: int = N_HASH_SHARDS,
+                versioned: bool = False) -> Union[VectorStore, Dict[str, VectorStore]]:
     """
     Create a FAISS vector store from a list of LangChain Documents and save it locally.
 
@@ -68,12 +184,30 @@ def get_ingests(docs: List[Document],
     then iteratively adds the remaining documents in batches to avoid memory issues.
     Finally, the index is saved locally for later use.
 
+    When `shard_by` is given, one independent FAISS index is built per shard
+    (primary arXiv category or hash range) and saved under
+    `FAISS_SHARDS_PATH/<shard name>`, so that each shard can be rebuilt, loaded
+    and served on its own. The shards of a previous build are replaced as a
+    whole, once every new shard is written.
+
+    When `versioned` is True, the index is written to a new snapshot under
+    `INDEX_VERSIONS_PATH/<version>` together with a manifest (build time,
+    document count, embedding model), and only published once fully written so
+    that a running server can hot-swap to it. Only the `INDEX_VERSIONS_KEEP`
+    most recent versions are kept.
+
     Args:
         docs (List[Document]): A list of LangChain Document objects to index.
-        BATCH_SIZE (int, optional): Number of documents to process at a time. Default is 512.
+        batch_size (int, optional): Number of documents to process at a time. Default is 512.
+        shard_by (Optional[str], optional): None for a single monolithic index,
+            "category" or "hash" for a sharded index. Default is None.
+        n_shards (int, optional): Number of shards when `shard_by` is "hash".
+        versioned (bool, optional): Write a new versioned snapshot instead of
+            overwriting FAISS_INDEX_PATH / FAISS_SHARDS_PATH. Default is False.
 
     Returns:
-        VectorStore: The FAISS vector store containing all the document embeddings.
+        Union[VectorStore, Dict[str, VectorStore]]: The FAISS vector store containing
+            all the document embeddings, or one vector store per shard name.
 
     Raises:
         ValueError: If the docs list is empty.
@@ -82,20 +216,45 @@ def get_ingests(docs: List[Document],
         raise ValueError("The docs list is empty. Cannot create FAISS index.")
     
     embeddings_model = get_embeddings_model()
+    version = new_version_name() if versioned else None
+    if versioned and os.path.exists(staging_dir(version)):
+        raise FileExistsError(f"Index version {version} is already being built.")
 
-    # Initialize FAISS with the first batch
-    initial_batch = docs[:batch_size]
-    faiss_store = FAISS.from_documents(initial_batch, embedding=embeddings_model)
+    if shard_by is None:
+        faiss_store = _build_faiss_store(docs, embeddings_model, batch_size)
+        # Save the FAISS index locally. Serving processes memory-map its files, so
+        # they are never rewritten in place: a new directory replaces the old one
+        index_root = staging_dir(version) if versioned else FAISS_INDEX_PATH.rstrip(os.sep) + ".staging"
+        if not versioned:
+            shutil.rmtree(index_root, ignore_errors=True)
+        save_faiss_index(faiss_store, index_root)
+        if versioned:
+            manifest = publish_version(version, doc_count=len(docs), layout="flat")
+            print(f"Index version {manifest['version']} published.")
+            prune_versions(keep=INDEX_VERSIONS_KEEP)
+        else:
+            _replace_dir(index_root, FAISS_INDEX_PATH)
+        return faiss_store
 
-    # Add remaining documents in batches
-    for idx in tqdm(range(batch_size, len(docs), batch_size), desc="Adding documents to FAISS"):
-        batch_docs = docs[idx: idx + batch_size]
-        faiss_store.add_documents(batch_docs)
+    if versioned:
+        shards_root = staging_dir(version)
+    else:
+        shards_root = FAISS_SHARDS_PATH.rstrip(os.sep) + ".staging"
+        shutil.rmtree(shards_root, ignore_errors=True)
+    stores: Dict[str, VectorStore] = {}
+    for name, shard_docs in split_into_shards(docs, shard_by, n_shards).items():
+        print(f"Indexing shard {name} ({len(shard_docs)} documents)...")
+        stores[name] = _build_faiss_store(shard_docs, embeddings_model, batch_size)
+        save_faiss_index(stores[name], os.path.join(shards_root, name))
 
-    # Save the FAISS index locally
-    faiss_store.save_local(FAISS_INDEX_PATH)
+    if versioned:
+        manifest = publish_version(version, doc_count=len(docs), layout="sharded", shards=list(stores))
+        print(f"Index version {manifest['version']} published.")
+        prune_versions(keep=INDEX_VERSIONS_KEEP)
+    else:
+        _replace_dir(shards_root, FAISS_SHARDS_PATH)
     
-    return faiss_store
+    return stores
 
 
 if __name__ == "__main__":
@@ -103,6 +262,9 @@ if __name__ == "__main__":
         data = pd.read_parquet(DATA_PATH)
         print("FAISS VectorStore loaded successfully !")
         docs = transform_to_docs(data)
-        faiss_index = get_ingests(docs=docs)
+        args = sys.argv[1:]
+        versioned = "--versioned" in args
+        shard_by = next((a for a in args if not a.startswith("--")), None)
+        faiss_index = get_ingests(docs=docs, shard_by=shard_by, versioned=versioned)
     else:
         print(f"Unknown file: {DATA_PATH}")
\ No newline at end of file
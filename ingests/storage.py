@@ -0,0 +1,109 @@
+import json
+import mmap
+import os
+import pickle
+from typing import Dict, Union
+
+import faiss
+from langchain.schema import Document
+from langchain.vectorstores import FAISS
+from langchain_community.docstore.base import Docstore
+from langchain_core.embeddings import Embeddings
+
+
+DOCSTORE_FILE = "docstore.jsonl"
+DOCSTORE_OFFSETS_FILE = "docstore.offsets.json"
+
+
+# ======================================
+#      Memory-Mapped Index Storage
+# ======================================
+
+class MmapDocstore(Docstore):
+    """
+    A read-only docstore reading Documents from a memory-mapped JSON Lines file.
+
+    The file is mapped read-only, so its pages live in the OS page cache and are
+    shared by every process serving the same index, instead of each worker
+    holding its own unpickled copy of all the Documents.
+    """
+
+    def __init__(self, path: str, offsets: Dict[str, list]):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = offsets
+
+    def search(self, search: str) -> Union[str, Document]:
+        if search not in self._offsets:
+            return f"ID {search} not found."
+        start, length = self._offsets[search]
+        record = json.loads(self._mmap[start: start + length])
+        return Document(page_content=record["page_content"], metadata=record["metadata"])
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+def write_mmap_docstore(store: FAISS, folder_path: str) -> None:
+    """
+    Export the docstore of a FAISS vector store as memory-mappable files.
+
+    Writes `docstore.jsonl` (one Document per line) and `docstore.offsets.json`
+    (byte range of each Document and the FAISS position to docstore id mapping)
+    next to the index files.
+
+    Args:
+        store (FAISS): The vector store whose Documents are exported.
+        folder_path (str): The directory the index was saved to.
+    """
+    offsets: Dict[str, list] = {}
+    with open(os.path.join(folder_path, DOCSTORE_FILE), "wb") as f:
+        for doc_id in store.index_to_docstore_id.values():
+            doc = store.docstore.search(doc_id)
+            line = json.dumps({"page_content": doc.page_content, "metadata": doc.metadata},
+                              ensure_ascii=False, default=str).encode("utf-8")
+            offsets[doc_id] = [f.tell(), len(line)]
+            f.write(line + b"\n")
+
+    with open(os.path.join(folder_path, DOCSTORE_OFFSETS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"index_to_docstore_id": store.index_to_docstore_id, "offsets": offsets}, f)
+
+def save_faiss_index(store: FAISS, folder_path: str) -> None:
+    """
+    Save a FAISS vector store with both its pickled and memory-mappable docstore.
+    """
+    store.save_local(folder_path)
+    write_mmap_docstore(store, folder_path)
+
+def load_faiss_index(folder_path: str, embeddings: Embeddings) -> FAISS:
+    """
+    Load a FAISS vector store with its vectors and Documents memory-mapped.
+
+    The index is read with `IO_FLAG_MMAP_IFC`, so flat vectors are mapped from
+    `index.faiss` instead of copied into each process. Indexes saved without a
+    memory-mappable docstore (e.g. by `FAISS.save_local`) fall back to the
+    pickled one in `index.pkl`.
+
+    Args:
+        folder_path (str): The directory the index was saved to.
+        embeddings (Embeddings): The embedding model used to build the index.
+
+    Returns:
+        FAISS: A read-only FAISS vector store.
+    """
+    io_flags = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+    offsets_path = os.path.join(folder_path, DOCSTORE_OFFSETS_FILE)
+    index = faiss.read_index(os.path.join(folder_path, "index.faiss"), io_flags)
+
+    if not os.path.isfile(offsets_path):
+        # FAISS.load_local cannot pass io_flags to faiss.read_index, hence the manual load
+        with open(os.path.join(folder_path, "index.pkl"), "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+        return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+    with open(offsets_path, encoding="utf-8") as f:
+        layout = json.load(f)
+    docstore = MmapDocstore(os.path.join(folder_path, DOCSTORE_FILE), layout["offsets"])
+    # JSON object keys are strings, FAISS positions are ints
+    index_to_docstore_id = {int(i): doc_id for i, doc_id in layout["index_to_docstore_id"].items()}
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
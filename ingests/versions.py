@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from constants import EMBEDDINGS_MODEL_NAME, INDEX_VERSIONS_KEEP, INDEX_VERSIONS_PATH
+
+
+MANIFEST_FILE = "manifest.json"
+RELOAD_REQUEST_FILE = "reload_request.json"
+_STAGING_SUFFIX = ".staging"
+
+
+# ======================================
+#        Versioned Index Snapshots
+# ======================================
+
+def new_version_name() -> str:
+    """
+    Return a sortable version name built from the current UTC time.
+
+    Microseconds are included so that two builds started in the same second
+    get distinct versions.
+
+    Returns:
+        str: A version name such as '20250101T120000123456Z'.
+    """
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+def staging_dir(version: str, root: str = INDEX_VERSIONS_PATH) -> str:
+    """
+    Return the directory an index version is written to before being published.
+
+    Readers only look at published versions, so a half-written index is never
+    picked up by a running server.
+    """
+    return os.path.join(root, version + _STAGING_SUFFIX)
+
+def publish_version(version: str,
+                    doc_count: int,
+                    layout: str = "flat",
+                    shards: Optional[List[str]] = None,
+                    embedding_model: str = EMBEDDINGS_MODEL_NAME,
+                    root: str = INDEX_VERSIONS_PATH) -> Dict:
+    """
+    Write the manifest of a staged index version and publish it atomically.
+
+    Args:
+        version (str): The version name used to stage the index.
+        doc_count (int): Number of indexed documents.
+        layout (str, optional): "flat" for a single FAISS index, "sharded" for one
+            sub-directory per shard. Defaults to "flat".
+        shards (Optional[List[str]], optional): Shard names of a sharded layout.
+        embedding_model (str, optional): Embedding model used to build the index.
+        root (str, optional): Directory holding every version. Defaults to INDEX_VERSIONS_PATH.
+
+    Returns:
+        Dict: The written manifest.
+
+    Raises:
+        FileNotFoundError: If the version was not staged first.
+        FileExistsError: If the version is already published.
+    """
+    staged = staging_dir(version, root)
+    if not os.path.isdir(staged):
+        raise FileNotFoundError(f"No staged index for version {version} in {root}.")
+    if os.path.exists(os.path.join(root, version)):
+        raise FileExistsError(f"Index version {version} is already published in {root}.")
+
+    manifest = {
+        "version": version,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "doc_count": doc_count,
+        "embedding_model": embedding_model,
+        "layout": layout,
+        "shards": shards or [],
+    }
+    with open(os.path.join(staged, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # rename() is atomic on a single filesystem
+    os.rename(staged, os.path.join(root, version))
+    return manifest
+
+def list_versions(root: str = INDEX_VERSIONS_PATH) -> List[str]:
+    """
+    List the published index versions, oldest first.
+
+    Staged versions are skipped even once their manifest is written, as they
+    are about to be renamed (or were left behind by an interrupted build).
+    """
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        name for name in os.listdir(root)
+        if not name.endswith(_STAGING_SUFFIX)
+        and os.path.isfile(os.path.join(root, name, MANIFEST_FILE))
+    )
+
+def latest_version(root: str = INDEX_VERSIONS_PATH) -> Optional[str]:
+    """
+    Return the most recent published index version, or None if there is none.
+    """
+    versions = list_versions(root)
+    return versions[-1] if versions else None
+
+def version_dir(version: str, root: str = INDEX_VERSIONS_PATH) -> str:
+    return os.path.join(root, version)
+
+def read_manifest(version: str, root: str = INDEX_VERSIONS_PATH) -> Dict:
+    """
+    Read the manifest of a published index version.
+
+    Raises:
+        FileNotFoundError: If the version does not exist or is not published yet.
+    """
+    path = os.path.join(root, version, MANIFEST_FILE)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Unknown index version: {version}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def request_reload(version: Optional[str] = None, root: str = INDEX_VERSIONS_PATH) -> Dict:
+    """
+    Record the index version every serving process should reload.
+
+    Each worker of a multi-worker server watches this file, so a reload asked
+    to any one of them reaches all of them.
+
+    Args:
+        version (Optional[str], optional): The version to pin, or None to follow
+            the latest published version.
+        root (str, optional): Directory holding every version. Defaults to INDEX_VERSIONS_PATH.
+
+    Returns:
+        Dict: The written request.
+    """
+    os.makedirs(root, exist_ok=True)
+    request = {"version": version, "requested_at": datetime.now(timezone.utc).isoformat()}
+    tmp = os.path.join(root, f".{RELOAD_REQUEST_FILE}.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(request, f)
+    os.replace(tmp, os.path.join(root, RELOAD_REQUEST_FILE))
+    return request
+
+def read_reload_request(root: str = INDEX_VERSIONS_PATH) -> Optional[Dict]:
+    """
+    Return the last reload request, or None if no reload was ever requested.
+    """
+    path = os.path.join(root, RELOAD_REQUEST_FILE)
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def prune_versions(keep: int = INDEX_VERSIONS_KEEP, root: str = INDEX_VERSIONS_PATH) -> List[str]:
+    """
+    Delete all but the `keep` most recent published versions.
+
+    Returns:
+        List[str]: The deleted version names.
+    """
+    versions = list_versions(root)
+    removed = versions[:-keep] if keep > 0 else versions
+    for version in removed:
+        shutil.rmtree(os.path.join(root, version))
+    return removed
@@ -0,0 +1,151 @@
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain.schema import Document
+from langchain.vectorstores import FAISS, VectorStore
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import Embeddings
+
+from constants import FAISS_SHARDS_PATH
+from ingests.storage import load_faiss_index
+
+
+class ShardedRetriever(VectorStore):
+    """
+    A read-only vector store fanning a query out over several FAISS shards.
+
+    The query is embedded once, every selected shard returns its local top-k
+    on a thread pool (FAISS releases the GIL while searching), and the local
+    results are merged with a heap into the global top-k. Shards are loaded
+    independently, so a node can serve any subset of them.
+    """
+
+    def __init__(self,
+                 shards: Dict[str, FAISS],
+                 embeddings: Embeddings,
+                 max_workers: Optional[int] = None):
+        if not shards:
+            raise ValueError("A ShardedRetriever needs at least one shard.")
+        self.shards = shards
+        self._embeddings = embeddings
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(shards),
+            thread_name_prefix="faiss-shard"
+        )
+
+    @classmethod
+    def load(cls,
+             embeddings: Embeddings,
+             path: str = FAISS_SHARDS_PATH,
+             shard_names: Optional[Iterable[str]] = None,
+             max_workers: Optional[int] = None) -> "ShardedRetriever":
+        """
+        Load FAISS shards saved by `get_ingests(..., shard_by=...)`.
+
+        Args:
+            embeddings (Embeddings): The embedding model used to build the shards.
+            path (str, optional): Directory holding one sub-directory per shard.
+                Defaults to FAISS_SHARDS_PATH.
+            shard_names (Optional[Iterable[str]], optional): Shards to load. Every
+                shard found under `path` is loaded when None.
+            max_workers (Optional[int], optional): Size of the search thread pool.
+                Defaults to the number of loaded shards.
+
+        Returns:
+            ShardedRetriever: A retriever over the loaded shards.
+
+        Raises:
+            FileNotFoundError: If a requested shard does not exist under `path`.
+        """
+        available = sorted(
+            name for name in os.listdir(path)
+            if os.path.isfile(os.path.join(path, name, "index.faiss"))
+        )
+        names = available if shard_names is None else list(shard_names)
+        missing = set(names) - set(available)
+        if missing:
+            raise FileNotFoundError(f"Unknown shard(s) in {path}: {', '.join(sorted(missing))}")
+
+        shards = {
+            name: load_faiss_index(os.path.join(path, name), embeddings)
+            for name in names
+        }
+        return cls(shards, embeddings, max_workers=max_workers)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embeddings
+
+    def close(self) -> None:
+        """
+        Stop the search thread pool and release the loaded shards.
+        """
+        self._executor.shutdown(wait=False)
+        for store in self.shards.values():
+            close = getattr(store.docstore, "close", None)
+            if callable(close):
+                close()
+        self.shards = {}
+
+    def similarity_search_with_score_by_vector(self,
+                                               embedding: List[float],
+                                               k: int = 4,
+                                               shards: Optional[Iterable[str]] = None,
+                                               **kwargs: Any) -> List[Tuple[Document, float]]:
+        """
+        Search the selected shards in parallel and merge their local top-k.
+
+        Args:
+            embedding (List[float]): The query embedding.
+            k (int, optional): Number of documents to return. Defaults to 4.
+            shards (Optional[Iterable[str]], optional): Names of the shards to
+                search (e.g. a category filter). Every loaded shard when None.
+
+        Returns:
+            List[Tuple[Document, float]]: The global top-k Documents with their
+                distance (or similarity) scores, best first.
+        """
+        names = list(self.shards) if shards is None else [s for s in shards if s in self.shards]
+        if not names:
+            return []
+
+        futures = [
+            self._executor.submit(self.shards[name].similarity_search_with_score_by_vector, embedding, k, **kwargs)
+            for name in names
+        ]
+        results = chain.from_iterable(f.result() for f in futures)
+
+        # FAISS returns distances for L2 (lower is better) and similarities for inner product
+        strategy = self.shards[names[0]].distance_strategy
+        select = heapq.nlargest if strategy == DistanceStrategy.MAX_INNER_PRODUCT else heapq.nsmallest
+        return select(k, results, key=lambda pair: pair[1])
+
+    def similarity_search_with_score(self,
+                                     query: str,
+                                     k: int = 4,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        embedding = self._embeddings.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search_by_vector(self,
+                                    embedding: List[float],
+                                    k: int = 4,
+                                    **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search(self,
+                          query: str,
+                          k: int = 4,
+                          **kwargs: Any) -> List[Document]:
+        kwargs.pop("return_score", None)
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("Shards are built offline with `get_ingests(..., shard_by=...)`.")
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None, **kwargs: Any):
+        raise NotImplementedError("Use `ShardedRetriever.load` to open shards built by `get_ingests`.")
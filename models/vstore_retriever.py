@@ -1,19 +1,313 @@
-from langchain.vectorstores import FAISS, VectorStore
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from langchain.vectorstores import VectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
 
-from constants import EMBEDDINGS_MODEL_NAME, FAISS_INDEX_PATH
+from config import SERVED_SHARDS
+from constants import EMBEDDINGS_MODEL_NAME, FAISS_INDEX_PATH, FAISS_SHARDS_PATH, INDEX_VERSIONS_PATH
+from ingests.storage import load_faiss_index
+from ingests.versions import latest_version, read_manifest, read_reload_request, request_reload, version_dir
+from models.sharded_retriever import ShardedRetriever
 
 
 embedding_model = HuggingFaceEmbeddings(model_name=EMBEDDINGS_MODEL_NAME)
 
-vector_store: VectorStore = FAISS.load_local(
-    FAISS_INDEX_PATH,
-    embeddings=embedding_model,
-    allow_dangerous_deserialization=True
-    )
-
-retriever = vector_store.as_retriever(
-    search_type = "similarity",
-    search_kwargs = {"k" : 5,
-                     "return_score" : True}
-    )
\ No newline at end of file
+# Status reported by each serving process, one `<pid>.json` file per worker
+WORKERS_STATUS_PATH = os.path.join(INDEX_VERSIONS_PATH, ".workers")
+
+
+def _served_shards() -> Optional[List[str]]:
+    """
+    Return the shard names listed in SERVED_SHARDS, or None to serve every shard.
+    """
+    if not SERVED_SHARDS or SERVED_SHARDS.strip() == "*":
+        return None
+    return [s.strip() for s in SERVED_SHARDS.split(",") if s.strip()]
+
+def load_vector_store(version: Optional[str] = None) -> "IndexHandle":
+    """
+    Load an index version, or the unversioned index when no version is published.
+
+    Args:
+        version (Optional[str], optional): The version to load. Defaults to the
+            latest published version.
+
+    Returns:
+        IndexHandle: The loaded vector store and its manifest.
+    """
+    version = version or latest_version()
+
+    if version is None:
+        # Unversioned layout: FAISS_INDEX_PATH, or FAISS_SHARDS_PATH when sharding is enabled
+        manifest = {"version": "unversioned", "layout": "sharded" if SERVED_SHARDS else "flat"}
+        path = FAISS_SHARDS_PATH if SERVED_SHARDS else FAISS_INDEX_PATH
+    else:
+        manifest = read_manifest(version)
+        path = version_dir(version)
+        if manifest.get("embedding_model", EMBEDDINGS_MODEL_NAME) != EMBEDDINGS_MODEL_NAME:
+            raise ValueError(f"Index version {version} was built with {manifest['embedding_model']}, "
+                             f"but the server embeds queries with {EMBEDDINGS_MODEL_NAME}.")
+
+    if manifest["layout"] == "sharded":
+        store = ShardedRetriever.load(embeddings=embedding_model, path=path, shard_names=_served_shards())
+    else:
+        store = load_faiss_index(path, embedding_model)
+    return IndexHandle(store, manifest)
+
+
+class IndexHandle:
+    """
+    A loaded vector store with the number of requests currently using it.
+    """
+
+    def __init__(self, store: VectorStore, manifest: Dict):
+        self.store = store
+        self.manifest = manifest
+        self.in_flight = 0
+        self.retired = False
+
+    def release(self) -> None:
+        # ShardedRetriever closes its pool and shards, FAISS closes a memory-mapped docstore
+        close = getattr(self.store, "close", None) or getattr(getattr(self.store, "docstore", None), "close", None)
+        if callable(close):
+            close()
+        self.store = None
+
+
+class IndexManager:
+    """
+    Serve the current vector store and hot-swap it for a new index version.
+
+    Requests borrow the current index through `acquire()`. A new version is
+    loaded and warmed in a background thread, then swapped in atomically; the
+    previous index is released once the last request that borrowed it returns.
+    """
+
+    def __init__(self, handle: IndexHandle):
+        self._current = handle
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._retired: List[IndexHandle] = []
+        self.last_error: Optional[str] = None
+        self.failed_version: Optional[str] = None
+        # Set by an explicit reload of a given version (e.g. a rollback)
+        self.pinned_version: Optional[str] = None
+        # Newest published version the watcher has already acted upon
+        self._known_latest: Optional[str] = latest_version()
+        # Last reload request (see `request_reload`) this process has acted upon
+        self._applied_request: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        return self._current.manifest["version"]
+
+    @contextmanager
+    def acquire(self) -> Iterator[VectorStore]:
+        """
+        Borrow the current vector store for the duration of a request.
+        """
+        with self._lock:
+            handle = self._current
+            handle.in_flight += 1
+        try:
+            yield handle.store
+        finally:
+            with self._lock:
+                handle.in_flight -= 1
+                drained = handle.retired and handle.in_flight == 0
+                if drained:
+                    self._retired.remove(handle)
+            if drained:
+                handle.release()
+
+    def swap(self, handle: IndexHandle) -> None:
+        """
+        Make `handle` the current index and retire the previous one.
+        """
+        with self._lock:
+            old, self._current = self._current, handle
+            old.retired = True
+            drained = old.in_flight == 0
+            if not drained:
+                self._retired.append(old)
+        if drained:
+            old.release()
+
+    def reload(self, version: Optional[str] = None) -> Dict:
+        """
+        Load and warm an index version, then swap it in.
+
+        Reloading a given version pins it: the watcher no longer replaces it
+        until a newer version is published. Reloading without a version
+        unpins and serves the latest published version.
+
+        Args:
+            version (Optional[str], optional): The version to load. Defaults to the
+                latest published version.
+
+        Returns:
+            Dict: The manifest of the index now being served.
+        """
+        with self._reload_lock:
+            return self._load_and_swap(version, pin=version is not None)
+
+    def _load_and_swap(self, version: Optional[str], pin: bool) -> Dict:
+        try:
+            handle = load_vector_store(version)
+            # Warm-up: touch the index and the embedding model before serving traffic
+            handle.store.similarity_search("warm-up", k=1)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            self.failed_version = version or latest_version()
+            raise
+
+        self.swap(handle)
+        self.last_error = self.failed_version = None
+        self.pinned_version = self.version if pin else None
+        if not pin and self.version != "unversioned":
+            self._known_latest = max(self._known_latest or self.version, self.version)
+        print(f"Index version {self.version} is now served.")
+        return handle.manifest
+
+    def reload_in_background(self, version: Optional[str] = None, pin: Optional[bool] = None) -> bool:
+        """
+        Start `reload` in a background thread.
+
+        Args:
+            version (Optional[str], optional): The version to load. Defaults to the
+                latest published version.
+            pin (Optional[bool], optional): Whether to pin the version. Defaults to
+                pinning when a version is given, as `reload` does.
+
+        Returns:
+            bool: False if a reload is already running, True otherwise.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        def _run():
+            try:
+                self._load_and_swap(version, pin=version is not None if pin is None else pin)
+            except Exception:
+                print(f"Index reload failed: {self.last_error}")
+            finally:
+                self._reload_lock.release()
+
+        threading.Thread(target=_run, name="index-reload", daemon=True).start()
+        return True
+
+    def request_reload(self, version: Optional[str] = None) -> bool:
+        """
+        Reload this process in the background and ask every other worker to follow.
+
+        The request is written next to the index versions, where the watcher of
+        each worker picks it up (see `watch`).
+
+        Args:
+            version (Optional[str], optional): The version to pin. Defaults to
+                unpinning and serving the latest published version.
+
+        Returns:
+            bool: False if a reload is already running in this process, True otherwise.
+        """
+        if not self.reload_in_background(version):
+            return False
+        self._applied_request = request_reload(version)["requested_at"]
+        return True
+
+    def _follow_reload_request(self) -> None:
+        request = read_reload_request()
+        if request is None or request["requested_at"] == self._applied_request:
+            return
+        version = request["version"]
+        if (version or latest_version()) == self.version:
+            # Already served, e.g. by a worker forked after the request
+            self.pinned_version = version
+        elif not self.reload_in_background(version):
+            return  # Retried on the next poll
+        self._applied_request = request["requested_at"]
+
+    def _write_worker_status(self) -> None:
+        os.makedirs(WORKERS_STATUS_PATH, exist_ok=True)
+        path = os.path.join(WORKERS_STATUS_PATH, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "updated_at": time.time(), **self.status()}, f)
+        os.replace(path + ".tmp", path)
+
+    def worker_statuses(self) -> List[Dict]:
+        """
+        Return the last status reported by each live serving process.
+
+        Only processes running the watcher report their status.
+        """
+        if not os.path.isdir(WORKERS_STATUS_PATH):
+            return []
+        statuses = []
+        for name in sorted(os.listdir(WORKERS_STATUS_PATH)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(WORKERS_STATUS_PATH, name)
+            try:
+                os.kill(int(name[:-len(".json")]), 0)
+            except ProcessLookupError:
+                os.remove(path)  # Left behind by a worker that exited
+                continue
+            except (PermissionError, ValueError):
+                pass
+            with open(path, encoding="utf-8") as f:
+                statuses.append(json.load(f))
+        return statuses
+
+    def watch(self, interval: float) -> threading.Thread:
+        """
+        Poll for reload requests and newly published index versions, and hot-swap.
+
+        The watcher only reacts to a version published after the ones it has
+        already seen, so an explicit rollback is not undone and a version that
+        failed to load is not retried on every poll. It also applies the reload
+        requests made to any worker (see `request_reload`) and reports the status
+        of this process for `worker_statuses`.
+
+        Args:
+            interval (float): Seconds between two checks.
+
+        Returns:
+            threading.Thread: The daemon thread running the watcher.
+        """
+        def _run():
+            while True:
+                try:
+                    self._follow_reload_request()
+                    latest = latest_version()
+                    if latest is not None and latest != self._known_latest:
+                        if self.reload_in_background(latest, pin=False):
+                            self._known_latest = latest
+                    self._write_worker_status()
+                except Exception as e:
+                    # Keep watching: the versions directory may be written concurrently
+                    print(f"Index watcher error: {type(e).__name__}: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=_run, name="index-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "manifest": self._current.manifest,
+                "in_flight": self._current.in_flight,
+                "draining": [{"version": h.manifest["version"], "in_flight": h.in_flight} for h in self._retired],
+                "reloading": self._reload_lock.locked(),
+                "pinned_version": self.pinned_version,
+                "last_error": self.last_error,
+                "failed_version": self.failed_version,
+            }
+
+
+index_manager = IndexManager(load_vector_store())
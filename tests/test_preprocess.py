@@ -0,0 +1,66 @@
+import pandas as pd
+
+from data_collection.preprocess import drop_near_duplicates, minhash_signatures, near_duplicate_clusters
+
+
+ABSTRACT = (
+    "We study retrieval augmented generation for scientific question answering. "
+    "A dense retriever selects abstracts from a large collection of arXiv papers, "
+    "and a language model answers the question from the retrieved passages. "
+    "We compare several embedding models and chunking strategies, and show that "
+    "rephrasing the question into multiple queries improves recall on long-tail "
+    "topics. Our experiments on computer science categories indicate that fusing "
+    "the ranked lists of every query yields more faithful answers with fewer "
+    "hallucinated citations than a single query baseline."
+)
+EDITED_ABSTRACT = ABSTRACT.replace("several embedding models", "various embedding models")
+UNRELATED_ABSTRACT = (
+    "This paper introduces a convolutional architecture for semantic segmentation "
+    "of aerial images. Multi-scale features are aggregated with attention, and the "
+    "model is trained with a boundary-aware loss on three public benchmarks."
+)
+
+
+def _articles(rows):
+    return pd.DataFrame(rows, columns=["paper_id", "summary", "category", "date"]).assign(
+        date=lambda x: pd.to_datetime(x["date"])
+    )
+
+
+def test_clusters_exact_and_lightly_edited_copies():
+    signatures = minhash_signatures([ABSTRACT, ABSTRACT, EDITED_ABSTRACT, UNRELATED_ABSTRACT])
+
+    clusters = near_duplicate_clusters(signatures)
+
+    assert clusters[0] == clusters[1] == clusters[2]
+    assert clusters[3] != clusters[0]
+
+
+def test_keeps_most_recent_article_with_merged_categories():
+    data = _articles([
+        ("2401.00001v1", ABSTRACT, "cs.AI", "2024-01-01"),
+        ("2401.00002v1", UNRELATED_ABSTRACT, "cs.CV", "2024-01-02"),
+        ("2401.00001v3", EDITED_ABSTRACT, "cs.LG, cs.AI", "2024-03-01"),
+        ("2402.00003v1", ABSTRACT, "cs.CL", "2024-02-01"),
+    ])
+
+    deduplicated = drop_near_duplicates(data)
+
+    # The canonical article keeps its position, its categories come first
+    assert deduplicated["paper_id"].tolist() == ["2401.00002v1", "2401.00001v3"]
+    assert deduplicated["category"].tolist() == ["cs.CV", "cs.LG, cs.AI, cs.CL"]
+    assert list(deduplicated.columns) == list(data.columns)
+
+
+def test_empty_summaries_are_not_duplicates():
+    data = _articles([
+        ("2401.00001v1", "", "cs.AI", "2024-01-01"),
+        ("2401.00002v1", "", "cs.LG", "2024-01-02"),
+        ("2401.00003v1", None, "cs.CL", "2024-01-03"),
+        ("2401.00004v1", ABSTRACT, "cs.IR", "2024-01-04"),
+    ])
+
+    deduplicated = drop_near_duplicates(data)
+
+    assert deduplicated["paper_id"].tolist() == data["paper_id"].tolist()
+    assert deduplicated["category"].tolist() == data["category"].tolist()
@@ -0,0 +1,43 @@
+from langchain.schema import Document
+from langchain.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from ingests.storage import MmapDocstore, load_faiss_index, save_faiss_index
+
+
+EMBEDDINGS = DeterministicFakeEmbedding(size=16)
+
+DOCS = [
+    Document(page_content=f"Abstract number {i} about topic {i % 3}.",
+             metadata={"title": f"Paper {i}", "pdf_url": f"http://arxiv.org/pdf/{i}"})
+    for i in range(10)
+]
+
+
+def _search(store: FAISS, query: str = "Abstract number 4 about topic 1."):
+    return [(doc.page_content, doc.metadata, round(score, 5))
+            for doc, score in store.similarity_search_with_score(query, k=3)]
+
+
+def test_load_index_saved_by_save_local(tmp_path):
+    # Indexes built before the memory-mapped docstore only have index.faiss + index.pkl
+    store = FAISS.from_documents(DOCS, embedding=EMBEDDINGS)
+    store.save_local(str(tmp_path))
+
+    loaded = load_faiss_index(str(tmp_path), EMBEDDINGS)
+
+    assert not isinstance(loaded.docstore, MmapDocstore)
+    assert loaded.index.ntotal == len(DOCS)
+    assert _search(loaded) == _search(store)
+
+
+def test_load_index_with_mmap_docstore(tmp_path):
+    store = FAISS.from_documents(DOCS, embedding=EMBEDDINGS)
+    save_faiss_index(store, str(tmp_path))
+
+    loaded = load_faiss_index(str(tmp_path), EMBEDDINGS)
+
+    assert isinstance(loaded.docstore, MmapDocstore)
+    assert loaded.index_to_docstore_id == store.index_to_docstore_id
+    assert _search(loaded) == _search(store)
+    loaded.docstore.close()